@@ -1,20 +1,24 @@
 """Shared fixtures and test configuration for RAG system tests."""
 
-import os
-import tempfile
 from pathlib import Path
-from typing import Generator, AsyncGenerator
-from unittest.mock import Mock, MagicMock, AsyncMock
+from typing import TYPE_CHECKING, Any
+from unittest.mock import DEFAULT, MagicMock, Mock, patch
+
 import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
 
-from fastapi.testclient import TestClient
+    from fastapi.testclient import TestClient
 
 
 # ============================================================================
 # Mock Fixtures for Core Components
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config():
     """Create a mock configuration for testing."""
     from config import Config
@@ -30,125 +34,369 @@ def mock_config():
     )
 
 
-@pytest.fixture
-def mock_vector_store():
+class _StubToolManager:
+    """Tool manager stand-in with no registered tools and no sources."""
+
+    def get_tool_definitions(self):
+        return []
+
+    def get_last_sources(self):
+        return []
+
+    def reset_sources(self):
+        pass
+
+
+class _StubSessionManager:
+    """Session manager stand-in with no stored history."""
+
+    def __init__(self):
+        self.history_requests = []
+        self.add_exchange = MagicMock()
+
+    def get_conversation_history(self, session_id):
+        self.history_requests.append(session_id)
+        return None
+
+    def create_session(self):
+        return "new-session"
+
+
+@pytest.fixture(scope="session")
+def vector_store_module():
+    """Import vector_store, and with it chromadb, only when a test needs it."""
+    pytest.importorskip("chromadb")
+    import vector_store
+
+    return vector_store
+
+
+@pytest.fixture(scope="session")
+def ai_generator_module():
+    """Import ai_generator, and with it anthropic, only when a test needs it."""
+    pytest.importorskip("anthropic")
+    import ai_generator
+
+    return ai_generator
+
+
+@pytest.fixture(scope="session")
+def search_tools_module(vector_store_module):
+    """Import search_tools, which depends on vector_store."""
+    import search_tools
+
+    return search_tools
+
+
+@pytest.fixture(scope="session")
+def rag_system_module(vector_store_module, ai_generator_module):
+    """Import rag_system, which depends on every component module."""
+    import rag_system
+
+    return rag_system
+
+
+@pytest.fixture(scope="session")
+def _component_specs(vector_store_module, ai_generator_module):
+    """
+    Attribute names of the real components, computed once per session.
+    Passing these to Mock(spec=...) skips the dir() introspection Mock
+    would otherwise repeat for every test. Sharing a Mock template via
+    copy.copy is not an option: copies share their child mocks, so return
+    values and call counts would leak between tests.
+    """
+    from document_processor import DocumentProcessor
+    from session_manager import SessionManager
+
+    return {
+        cls.__name__: dir(cls)
+        for cls in (
+            vector_store_module.VectorStore,
+            ai_generator_module.AIGenerator,
+            SessionManager,
+            DocumentProcessor,
+        )
+    }
+
+
+def _configure_vector_store(store):
+    store.search.return_value = []
+    store.get_course_count.return_value = 0
+    store.get_existing_course_titles.return_value = []
+
+
+def _configure_ai_generator(generator):
+    generator.generate_response.return_value = "Test AI response"
+
+
+def _configure_session_manager(manager):
+    manager.create_session.return_value = "test-session-123"
+    manager.get_conversation_history.return_value = None
+
+
+def _configure_document_processor(processor, course_and_chunks):
+    processor.process_course_document.return_value = course_and_chunks
+
+
+# Module-scoped component mocks, the helper that applies their defaults
+# and the fixtures whose values that helper takes
+_COMPONENT_MOCKS = {
+    "mock_vector_store": (_configure_vector_store, ()),
+    "mock_ai_generator": (_configure_ai_generator, ()),
+    "mock_session_manager": (_configure_session_manager, ()),
+    "mock_document_processor": (
+        _configure_document_processor,
+        ("sample_course_and_chunks",),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def mock_vector_store(_component_specs):
     """Create a mock vector store."""
-    store = Mock()
-    store.add_course_metadata = Mock()
-    store.add_course_content = Mock()
-    store.search = Mock(return_value=[])
-    store.get_course_count = Mock(return_value=0)
-    store.get_existing_course_titles = Mock(return_value=[])
-    store.clear_all_data = Mock()
+    # Methods without a configured return value are created on first access
+    store = Mock(spec=_component_specs["VectorStore"])
+    _configure_vector_store(store)
     return store
 
 
-@pytest.fixture
-def mock_ai_generator():
+@pytest.fixture(scope="module")
+def mock_ai_generator(_component_specs):
     """Create a mock AI generator."""
-    generator = Mock()
-    generator.generate_response = Mock(return_value="Test AI response")
+    generator = Mock(spec=_component_specs["AIGenerator"])
+    _configure_ai_generator(generator)
     return generator
 
 
-@pytest.fixture
-def mock_session_manager():
+@pytest.fixture(scope="module")
+def mock_session_manager(_component_specs):
     """Create a mock session manager."""
-    manager = Mock()
-    manager.create_session = Mock(return_value="test-session-123")
-    manager.get_conversation_history = Mock(return_value=None)
-    manager.add_exchange = Mock()
+    manager = Mock(spec=_component_specs["SessionManager"])
+    _configure_session_manager(manager)
     return manager
 
 
 @pytest.fixture
-def mock_document_processor():
-    """Create a mock document processor."""
-    processor = Mock()
-    from models import Course, Lesson, CourseChunk
+def vs_mock(_component_specs):
+    """Create a bare VectorStore-spec mock with no preset return values."""
+    return Mock(spec=_component_specs["VectorStore"])
+
+
+@pytest.fixture(scope="module")
+def seeded_tool_manager(_component_specs, search_tools_module):
+    """
+    Create a ToolManager with both course tools registered, once per module.
+    Only for tests that read tool definitions; the store mock is shared.
+    """
+    store = Mock(spec=_component_specs["VectorStore"])
+    manager = search_tools_module.ToolManager()
+    manager.register_tool(search_tools_module.CourseSearchTool(store))
+    manager.register_tool(search_tools_module.CourseOutlineTool(store))
+    return manager
+
 
-    # Create mock course and chunks
-    mock_course = Course(
+@pytest.fixture(scope="session")
+def sample_course_and_chunks():
+    """
+    Build the one-lesson course and single chunk the mock document
+    processor returns. Uses model_construct since these tests are not
+    about validation.
+    """
+    from models import Course, CourseChunk, Lesson
+
+    course = Course.model_construct(
         title="Test Course",
-        course_link="https://example.com/course",
-        instructor="Test Instructor",
-        lessons=[
-            Lesson(lesson_number=1, title="Introduction", lesson_link="https://example.com/lesson1"),
-            Lesson(lesson_number=2, title="Advanced Topics", lesson_link="https://example.com/lesson2"),
-        ]
+        lessons=[Lesson.model_construct(lesson_number=1, title="Lesson 1")]
     )
-
-    mock_chunks = [
-        CourseChunk(
-            content="This is the first chunk of test content.",
+    chunks = [
+        CourseChunk.model_construct(
+            content="Test content",
             course_title="Test Course",
             lesson_number=1,
             chunk_index=0
-        ),
-        CourseChunk(
-            content="This is the second chunk with more detailed information.",
-            course_title="Test Course",
-            lesson_number=1,
-            chunk_index=1
-        ),
+        )
     ]
+    return course, chunks
+
 
-    processor.process_course_document = Mock(return_value=(mock_course, mock_chunks))
+@pytest.fixture(scope="module")
+def mock_document_processor(_component_specs, sample_course_and_chunks):
+    """Create a mock document processor."""
+    processor = Mock(spec=_component_specs["DocumentProcessor"])
+    _configure_document_processor(processor, sample_course_and_chunks)
     return processor
 
 
+@pytest.fixture(autouse=True)
+def _reset_mocks(request):
+    """
+    Restore the module-scoped component mocks before each test.
+    Calls, return values and side effects set by earlier tests are cleared
+    and the defaults re-applied. Only mocks the test uses are touched.
+    """
+    for name, (configure, arg_names) in _COMPONENT_MOCKS.items():
+        if name in request.fixturenames:
+            mock = request.getfixturevalue(name)
+            mock.reset_mock(return_value=True, side_effect=True)
+            configure(mock, *map(request.getfixturevalue, arg_names))
+
+
 # ============================================================================
 # Test Fixtures for RAG System
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def rag_system(
+    rag_system_module,
     mock_config,
     mock_vector_store,
     mock_ai_generator,
     mock_session_manager,
     mock_document_processor
 ):
-    """Create a RAG system with mocked components."""
-    from rag_system import RAGSystem
-
-    system = RAGSystem.__new__(RAGSystem)
+    """
+    Create a RAG system with mocked components, once per module.
+    RAGSystem keeps no state of its own; its mocks are reset per test.
+    """
+    rag_system_cls = rag_system_module.RAGSystem
+    system = rag_system_cls.__new__(rag_system_cls)
     system.config = mock_config
     system.document_processor = mock_document_processor
     system.vector_store = mock_vector_store
     system.ai_generator = mock_ai_generator
     system.session_manager = mock_session_manager
 
-    # Mock tool manager
-    from search_tools import ToolManager
-    system.tool_manager = ToolManager()
-    system.tool_manager.get_tool_definitions = Mock(return_value=[])
-    system.tool_manager.get_last_sources = Mock(return_value=[])
-    system.tool_manager.reset_sources = Mock()
+    # Nothing asserts on the tool manager, so a plain stub is enough
+    system.tool_manager = _StubToolManager()
 
     return system
 
 
+@pytest.fixture
+def stub_session_manager(rag_system, monkeypatch):
+    """Swap rag_system's session manager for a fresh _StubSessionManager."""
+    stub = _StubSessionManager()
+    monkeypatch.setattr(rag_system, "session_manager", stub)
+    return stub
+
+
+@pytest.fixture(scope="module")
+def overlap_processor():
+    """Create a small-chunk DocumentProcessor for overlap tests, once per module."""
+    from document_processor import DocumentProcessor
+
+    return DocumentProcessor(chunk_size=200, chunk_overlap=50)
+
+
+@pytest.fixture
+def session_manager():
+    """Create a fresh SessionManager keeping two exchanges."""
+    from session_manager import SessionManager
+
+    return SessionManager(max_history=2)
+
+
+@pytest.fixture(scope="module")
+def rag_patches(rag_system_module):
+    """
+    Patch every component RAGSystem constructs, once per test module.
+    Yields the mapping of patched names to their mocks.
+    """
+    patcher = patch.multiple(
+        rag_system_module,
+        DocumentProcessor=DEFAULT,
+        VectorStore=DEFAULT,
+        AIGenerator=DEFAULT,
+        SessionManager=DEFAULT,
+        ToolManager=DEFAULT,
+        CourseSearchTool=DEFAULT,
+        CourseOutlineTool=DEFAULT,
+    )
+    yield patcher.start()
+    patcher.stop()
+
+
+@pytest.fixture
+def fake_chroma(monkeypatch, vector_store_module):
+    """Replace the chromadb module used by vector_store with a MagicMock."""
+    fake = MagicMock()
+    monkeypatch.setattr(vector_store_module, "chromadb", fake)
+    return fake
+
+
+@pytest.fixture(scope="session")
+def _chroma_collection_spec(vector_store_module):
+    """Attribute names of a chromadb Collection, computed once per session."""
+    # vector_store_module has already checked that chromadb is importable
+    from chromadb.api.models.Collection import Collection
+
+    return dir(Collection)
+
+
+@pytest.fixture
+def vector_store_with_mock_collection(
+    fake_chroma,
+    _chroma_collection_spec,
+    vector_store_module
+):
+    """
+    Create a VectorStore whose collections are a single mock collection.
+    Returns a (store, mock_collection) tuple.
+    """
+    mock_collection = Mock(spec=_chroma_collection_spec)
+    fake_chroma.PersistentClient.return_value.get_or_create_collection.return_value = mock_collection
+    store = vector_store_module.VectorStore(":memory:", "test-model", 5)
+    return store, mock_collection
+
+
 # ============================================================================
 # Test Fixtures for API Testing
 # ============================================================================
 
-@pytest.fixture
+# Pydantic models mirroring app.py, defined once so tests can import them
+class QueryRequest(BaseModel):
+    query: str
+    session_id: str | None = None
+
+
+class QueryResponse(BaseModel):
+    answer: str
+    sources: list[dict[str, Any]]
+    session_id: str
+
+
+class CourseStats(BaseModel):
+    total_courses: int
+    course_titles: list[str]
+
+
+# Default mock responses, restored before each test by _reset_app_state
+DEFAULT_QUERY_RESPONSE = QueryResponse(
+    answer="Test answer",
+    sources=[{"course": "Test Course", "lesson": 1, "content": "Test content"}],
+    session_id="test-session-123"
+)
+DEFAULT_COURSE_STATS = CourseStats(
+    total_courses=2,
+    course_titles=["Course 1", "Course 2"]
+)
+
+
+@pytest.fixture(scope="session")
 def test_app():
     """
     Create a test FastAPI app without static file mounting.
     This avoids import issues with missing static files in test environment.
+
+    The app is built once per session; per-test state is restored by
+    ``_reset_app_state``.
     """
-    from fastapi import FastAPI
+    from fastapi import FastAPI, Response
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.middleware.trustedhost import TrustedHostMiddleware
-    from pydantic import BaseModel
-    from typing import List, Optional, Dict, Any
 
     app = FastAPI(title="Test Course Materials RAG System")
 
     # Add middleware
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -158,60 +406,74 @@ def test_app():
         expose_headers=["*"],
     )
 
-    # Pydantic models
-    class QueryRequest(BaseModel):
-        query: str
-        session_id: Optional[str] = None
-
-    class QueryResponse(BaseModel):
-        answer: str
-        sources: List[Dict[str, Any]]
-        session_id: str
-
-    class CourseStats(BaseModel):
-        total_courses: int
-        course_titles: List[str]
-
     # Store for mock responses
-    app.state.mock_query_response = QueryResponse(
-        answer="Test answer",
-        sources=[{"course": "Test Course", "lesson": 1, "content": "Test content"}],
-        session_id="test-session-123"
-    )
-    app.state.mock_course_stats = CourseStats(
-        total_courses=2,
-        course_titles=["Course 1", "Course 2"]
-    )
+    app.state.mock_query_response = DEFAULT_QUERY_RESPONSE
+    app.state.mock_course_stats = DEFAULT_COURSE_STATS
     app.state.query_should_fail = False
     app.state.courses_should_fail = False
-
-    @app.post("/api/query", response_model=QueryResponse)
+    app.state.json_cache = {}
+
+    def mock_json_response(name):
+        """Serve the mock as cached JSON bytes, re-encoding only when a test swaps it."""
+        model = getattr(app.state, name)
+        cached = app.state.json_cache.get(name)
+        if cached is None or cached[0] is not model:
+            cached = (model, model.model_dump_json().encode())
+            app.state.json_cache[name] = cached
+        return Response(content=cached[1], media_type="application/json")
+
+    # The mocks are already QueryResponse/CourseStats instances, so the
+    # routes skip response_model validation and JSON encoding entirely
+    @app.post("/api/query")
     async def query_documents(request: QueryRequest):
         if app.state.query_should_fail:
             from fastapi import HTTPException
             raise HTTPException(status_code=500, detail="Test error")
-        return app.state.mock_query_response
+        return mock_json_response("mock_query_response")
 
-    @app.get("/api/courses", response_model=CourseStats)
+    @app.get("/api/courses")
     async def get_course_stats():
         if app.state.courses_should_fail:
             from fastapi import HTTPException
             raise HTTPException(status_code=500, detail="Test error")
-        return app.state.mock_course_stats
+        return mock_json_response("mock_course_stats")
 
     return app
 
 
-@pytest.fixture
-def client(test_app) -> TestClient:
-    """Create a test client for the FastAPI app."""
-    return TestClient(test_app)
+@pytest.fixture(autouse=True)
+def _reset_app_state(request):
+    """Restore the shared test app's mock state before each test."""
+    if "test_app" not in request.fixturenames:
+        return
+    app = request.getfixturevalue("test_app")
+    app.state.query_should_fail = False
+    app.state.courses_should_fail = False
+    app.state.mock_query_response = DEFAULT_QUERY_RESPONSE
+    app.state.mock_course_stats = DEFAULT_COURSE_STATS
 
 
-@pytest.fixture
-def async_client(test_app) -> AsyncGenerator:
-    """Create an async test client for the FastAPI app."""
-    from httpx import AsyncClient, ASGITransport
+@pytest.fixture(scope="session")
+def client(test_app) -> "Generator[TestClient]":
+    """
+    Create a test client for the FastAPI app.
+    Entering the client keeps one event loop portal open for the whole
+    session instead of starting a new one for every request.
+    """
+    from fastapi.testclient import TestClient
+
+    with TestClient(test_app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client(test_app) -> "AsyncGenerator":
+    """
+    Create an async test client for the FastAPI app.
+    The client and its transport live on the session event loop and are
+    shared by all async tests; app state is reset per test.
+    """
+    from httpx import ASGITransport, AsyncClient
 
     async with AsyncClient(
         transport=ASGITransport(app=test_app),
@@ -224,7 +486,7 @@ def async_client(test_app) -> AsyncGenerator:
 # Test Data Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_course_text():
     """Sample course document text for testing."""
     return """Course Title: Advanced Python Programming
@@ -247,19 +509,25 @@ This lesson explores both concepts in depth.
 """
 
 
-@pytest.fixture
-def sample_course_file(sample_course_text, tmp_path) -> Path:
-    """Create a temporary sample course file."""
-    course_file = tmp_path / "sample_course.txt"
+@pytest.fixture(scope="session")
+def sample_course_file(sample_course_text, tmp_path_factory) -> Path:
+    """
+    Create a temporary sample course file.
+    Shared across the session, so tests must not modify it.
+    """
+    course_file = tmp_path_factory.mktemp("course") / "sample_course.txt"
     course_file.write_text(sample_course_text)
     return course_file
 
 
-@pytest.fixture
-def sample_courses_dir(sample_course_text, tmp_path) -> Path:
-    """Create a temporary directory with multiple course files."""
-    courses_dir = tmp_path / "courses"
-    courses_dir.mkdir()
+@pytest.fixture(scope="session")
+def sample_courses_dir(tmp_path_factory) -> Path:
+    """
+    Create a temporary directory with multiple course files.
+    Shared across the session; tests that add or remove files should work
+    on a ``shutil.copytree`` copy instead.
+    """
+    courses_dir = tmp_path_factory.mktemp("courses")
 
     # Create multiple course files
     courses = [
@@ -274,11 +542,23 @@ def sample_courses_dir(sample_course_text, tmp_path) -> Path:
     return courses_dir
 
 
+@pytest.fixture(scope="session")
+def processed_sample_course(sample_course_file):
+    """
+    Parse the sample course file once per session.
+    Returns the (course, chunks) tuple; tests must not modify it.
+    """
+    from document_processor import DocumentProcessor
+
+    processor = DocumentProcessor(chunk_size=800, chunk_overlap=100)
+    return processor.process_course_document(str(sample_course_file))
+
+
 # ============================================================================
 # Mock API Response Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_anthropic_response():
     """Mock response from Anthropic API."""
     return {
@@ -296,7 +576,7 @@ def mock_anthropic_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_search_results():
     """Mock search results from vector store."""
     return [
@@ -333,13 +613,13 @@ def temp_chroma_path(tmp_path) -> Path:
 # Session Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_session_id():
     """Sample session ID for testing."""
     return "test-session-abc-123"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_conversation_history():
     """Sample conversation history for testing."""
     return [